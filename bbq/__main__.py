@@ -5,6 +5,7 @@ from pathlib import Path
 import typer
 import yaml
 
+from bbq.core.planner import Planner
 from bbq.core.scheduler import Scheduler
 
 BBQ_DATA_DIR = Path(".bbq")
@@ -52,6 +53,13 @@ def build():
     scheduler.save()
 
 
+@app.command()
+def plan(parallelism: int = None):
+    scheduler = Scheduler.load(config)
+    planner = Planner(scheduler.task_graph, scheduler.cache)
+    planner.plan(parallelism or config["system"]["parallelism"]).log()
+
+
 @app.command()
 def list():
     logging.info("loading scheduler from pickled data")
@@ -1,13 +1,13 @@
 import hashlib
 import logging
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from bbq.core.task import Task
 
 
 # https://stackoverflow.com/a/44873382/9671542
-def _sha256sum(file: Path) -> str:
+def sha256sum(file: Path) -> str:
     file = Path(file)
     h = hashlib.sha256()
     b = bytearray(128 * 1024)
@@ -18,12 +18,27 @@ def _sha256sum(file: Path) -> str:
     return h.hexdigest()
 
 
+def _stat(file: Path) -> Tuple[int, int]:
+    st = Path(file).stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
 class CachedTask:
     def __init__(self, task_id: str) -> None:
         self.task_id = task_id
         self.input: Dict[Path, str] = dict()
+        self.input_stat: Dict[Path, Tuple[int, int]] = dict()
         self.output: Dict[Path, str] = dict()
+        self.output_stat: Dict[Path, Tuple[int, int]] = dict()
         self.upstream: Dict[str, CachedTask] = dict()
+        self.duration: Optional[float] = None
+
+    def __setstate__(self, state):
+        # fields added after the first cache format
+        state.setdefault("input_stat", dict())
+        state.setdefault("output_stat", dict())
+        state.setdefault("duration", None)
+        self.__dict__.update(state)
 
     def __str__(self) -> str:
         d = {"id": self.task_id, "input": self.input, "output": self.output}
@@ -60,55 +75,127 @@ class Cache:
     def _create_cached_task(self, task: Task, upstream: bool = False) -> CachedTask:
         cached_task = CachedTask(task.id)
         for p in task.output:
-            h = _sha256sum(self.build_output_dir / p)
-            cached_task.output[p] = h
+            self._record(
+                self.build_output_dir / p,
+                p,
+                cached_task.output,
+                cached_task.output_stat,
+            )
         if not upstream:
+            cached_task.duration = task.duration
             for p in task.input:
-                h = _sha256sum(p)
-                cached_task.input[p] = h
+                self._record(p, p, cached_task.input, cached_task.input_stat)
             for t in task.get_upstream():
                 cached_upstream = self._create_cached_task(t, upstream=True)
                 cached_task.upstream[t.id] = cached_upstream
         return cached_task
 
+    def _record(
+        self,
+        path: Path,
+        key: Path,
+        digests: Dict[Path, str],
+        stats: Dict[Path, Tuple[int, int]],
+    ) -> None:
+        before = _stat(path)
+        digests[key] = sha256sum(path)
+        # a file saved while being hashed must not pair its new stat info
+        # with the old digest
+        if _stat(path) == before:
+            stats[key] = before
+
     def outdated(self, task: Task) -> bool:
+        return self.stale_reason(task) is not None
+
+    def stale_reason(self, task: Task) -> Optional[str]:
+        """Tells why `task` has to run again, or returns None if it is up to
+        date. Files are checked against the recorded stat info first and only
+        hashed when it differs."""
         if task.id not in self.tasks:
-            return True
+            return "never built"
 
         cached_task = self.tasks[task.id]
-        if self._has_files_mismatch(cached_task, task):
-            return True
+        changed = self.changed_inputs(task)
+        if changed:
+            return f"input {changed[0]} changed"
+        changed = self.changed_outputs(task)
+        if changed:
+            return f"output {changed[0]} changed"
 
         if len(cached_task.upstream) != len(task.upstream_tasks):
-            return True
+            return "upstream tasks changed"
         for upstream in task.get_upstream():
             if upstream.id not in cached_task.upstream:
-                return True
-            cached_upstream = cached_task.upstream[upstream.id]
-            if self._has_files_mismatch(cached_upstream, upstream, output_only=True):
-                return True
-
-        return False
+                return "upstream tasks changed"
+            changed = self.changed_outputs(task, upstream)
+            if changed:
+                return f"output {changed[0]} of {upstream.friendly_name} changed"
 
-    def _has_files_mismatch(
-        self, cached: CachedTask, task: Task, output_only=False
-    ) -> bool:
-        if not output_only:
-            if len(cached.input) != len(task.input):
-                return True
-            for p in task.input:
-                if p not in cached.input:
-                    return True
-                if cached.input[p] != _sha256sum(p):
-                    return True
+        return None
 
-        if len(cached.output) != len(task.output):
+    def inputs_outdated(self, task: Task) -> bool:
+        """Checks only the task's own input files."""
+        if task.id not in self.tasks:
             return True
+        return len(self.changed_inputs(task)) > 0
+
+    def changed_inputs(self, task: Task) -> List[Path]:
+        cached_task = self.tasks[task.id]
+        changed = [p for p in cached_task.input if p not in task.input]
+        for p in task.input:
+            if p not in cached_task.input:
+                changed.append(p)
+            elif self._file_changed(p, p, cached_task.input, cached_task.input_stat):
+                changed.append(p)
+        return changed
+
+    def changed_outputs(
+        self, task: Task, upstream: Optional[Task] = None
+    ) -> List[Path]:
+        """Returns the outputs of `task` (or of one of its `upstream` tasks, as
+        recorded when `task` was cached) that no longer match the cache."""
+        cached = self.tasks[task.id]
+        if upstream is not None:
+            cached, task = cached.upstream[upstream.id], upstream
+        changed = [p for p in cached.output if p not in task.output]
         for p in task.output:
-            built_p = self.build_output_dir / p
             if p not in cached.output:
+                changed.append(p)
+            elif self._file_changed(
+                self.build_output_dir / p, p, cached.output, cached.output_stat
+            ):
+                changed.append(p)
+        return changed
+
+    def refresh_upstream_stat(self, task: Task) -> None:
+        """Copies the upstream output stat info recorded when the upstream
+        tasks were last cached, for outputs whose digests did not change."""
+        cached_task = self.tasks[task.id]
+        for upstream_id, cached_upstream in cached_task.upstream.items():
+            current = self.tasks.get(upstream_id)
+            if current is None:
+                continue
+            for p, digest in cached_upstream.output.items():
+                if current.output.get(p) == digest and p in current.output_stat:
+                    cached_upstream.output_stat[p] = current.output_stat[p]
+
+    def _file_changed(
+        self,
+        path: Path,
+        key: Path,
+        digests: Dict[Path, str],
+        stats: Dict[Path, Tuple[int, int]],
+    ) -> bool:
+        # a touched file whose digest still matches gets its stat info
+        # re-recorded, so that later checks stay at stat level
+        try:
+            before = _stat(path)
+            if stats.get(key) == before:
+                return False
+            if digests[key] != sha256sum(path):
                 return True
-            if cached.output[p] != _sha256sum(built_p):
-                return True
-
-        return False
+            if _stat(path) == before:
+                stats[key] = before
+            return False
+        except FileNotFoundError:
+            return True
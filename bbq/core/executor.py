@@ -2,6 +2,7 @@ import contextlib
 import logging
 import os
 import shutil
+import time
 from pathlib import Path
 from typing import Any, Dict
 
@@ -9,6 +10,7 @@ from bbq.core.cache import Cache
 from bbq.core.progress import Status
 from bbq.core.queue import Queue
 from bbq.core.task import Task
+from bbq.core.workspace import WorkspaceManager
 
 
 @contextlib.contextmanager
@@ -36,9 +38,7 @@ class Executor:
         self.result_queue: Queue = result_queue
         self.workers = None
         self.cache = cache
-
-        self.workspace.mkdir(parents=True, exist_ok=True)
-        self.build_output_dir.mkdir(parents=True, exist_ok=True)
+        self.workspace_manager = WorkspaceManager(self.config)
 
     def __getstate__(self):
         state = self.__dict__.copy()
@@ -48,7 +48,17 @@ class Executor:
 
         return state
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        # executors saved before workspaces were managed
+        if "workspace_manager" not in state:
+            self.workspace_manager = WorkspaceManager(self.config)
+
     def start(self) -> None:
+        self.workspace.mkdir(parents=True, exist_ok=True)
+        self.build_output_dir.mkdir(parents=True, exist_ok=True)
+
         while True:
             task = self.request_queue.pop()
             if task is None:
@@ -57,14 +67,21 @@ class Executor:
             logging.info(f"Running task {task.friendly_name}")
             # check cache to see if this thing needs to run
             if self.cache.outdated(task):
+                started = time.monotonic()
                 self.run_task(task)
+                task.duration = time.monotonic() - started
             else:
                 logging.info(
                     f"Skipping task {task.friendly_name} since its dependencies did not change"
                 )
                 task.status = Status.SKIPPED
             if task.status == Status.SUCCESS:
+                previous = self.cache.tasks.get(task.id)
                 self.cache.cache(task)
+                task.output_changed = (
+                    previous is None
+                    or previous.output != self.cache.tasks[task.id].output
+                )
             self.result_queue.put(task)
 
     def run_task(self, _: Task) -> None:
@@ -73,16 +90,16 @@ class Executor:
 
 class LocalExecutor(Executor):
     def run_task(self, task: Task) -> None:
-        task_workdir = self.workspace / task.friendly_name
-        task_workdir.mkdir(parents=True, exist_ok=True)
-        with workdir(task_workdir):
-            for src in task.input:
-                shutil.copy(src, task_workdir)
-            task.run()
-            for out in task.output:
-                src = task_workdir / out
-                dst = self.build_output_dir / out
-                shutil.copy(src, dst)
+        task_workdir = self.workspace_manager.acquire(task)
+        try:
+            with workdir(task_workdir):
+                task.run()
+                for out in task.output:
+                    src = task_workdir / out
+                    dst = self.build_output_dir / out
+                    shutil.copy(src, dst)
+        finally:
+            self.workspace_manager.release(task)
 
 
 class ChrootExecutor(Executor):
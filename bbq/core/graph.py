@@ -74,3 +74,18 @@ class Digraph:
                 visited.add(neighbor)
                 pending.append(neighbor)
                 yield neighbor
+
+    def topological_sort(self) -> List[Task]:
+        indegree: Dict[Task, int] = {node: self.indegree(node) for node in self.nodes}
+        pending = deque(node for node, d in indegree.items() if d == 0)
+        order: List[Task] = []
+        while len(pending) > 0:
+            node = pending.popleft()
+            order.append(node)
+            for neighbor in node.get_downstream():
+                indegree[neighbor] -= 1
+                if indegree[neighbor] == 0:
+                    pending.append(neighbor)
+        if len(order) != len(self):
+            raise Exception("cycle detected")
+        return order
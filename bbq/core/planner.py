@@ -0,0 +1,174 @@
+import heapq
+import logging
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+
+from bbq.core.cache import Cache
+from bbq.core.graph import Digraph
+from bbq.core.task import Task
+
+
+class Action(Enum):
+    RUN = 0
+    MAYBE = 1
+    SKIP = 2
+
+
+class PlannedTask:
+    def __init__(
+        self, task: Task, action: Action, reason: str, duration: Optional[float]
+    ) -> None:
+        self.task = task
+        self.action = action
+        self.reason = reason
+        self.duration = duration
+
+    def __str__(self) -> str:
+        action = self.action.name.lower()
+        return f"{action:<5} {self.task.friendly_name} ({self.reason})"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class Estimate:
+    def __init__(self) -> None:
+        self.total_time: float = 0.0
+        self.critical_path: List[PlannedTask] = []
+        self.critical_path_time: float = 0.0
+        self.estimated_time: float = 0.0
+
+    def __str__(self) -> str:
+        path = " -> ".join(t.task.friendly_name for t in self.critical_path)
+        return (
+            f"{self.estimated_time:.2f}s (total work {self.total_time:.2f}s, "
+            f"critical path {self.critical_path_time:.2f}s: {path or '-'})"
+        )
+
+
+class Plan:
+    def __init__(self, tasks: List[PlannedTask], parallelism: int) -> None:
+        self.tasks = tasks
+        self.parallelism = parallelism
+        self.has_timing_data = False
+        # best case: conditional tasks get cut off, worst case: they all run
+        self.best_case = Estimate()
+        self.worst_case = Estimate()
+
+    def with_action(self, *actions: Action) -> List[PlannedTask]:
+        return [t for t in self.tasks if t.action in actions]
+
+    def log(self) -> None:
+        for t in self.tasks:
+            logging.info(str(t))
+        logging.info(
+            f"{len(self.with_action(Action.RUN))} task(s) to run, "
+            f"{len(self.with_action(Action.MAYBE))} depending on upstream outputs, "
+            f"{len(self.with_action(Action.SKIP))} to skip"
+        )
+        if not self.has_timing_data:
+            logging.info("Estimated time: no timing data")
+            return
+        logging.info(f"Parallelism: {self.parallelism}")
+        logging.info(f"Estimated time (best case): {self.best_case}")
+        logging.info(f"Estimated time (worst case): {self.worst_case}")
+
+
+class Planner:
+    """Predicts what a build would do without running anything.
+
+    Only the stat info recorded in the cache is checked up front; files are
+    hashed only when their stat info differs, to tell real changes apart
+    from touched files."""
+
+    def __init__(self, task_graph: Digraph, cache: Cache) -> None:
+        self.task_graph = task_graph
+        self.cache = cache
+
+    def plan(self, parallelism: int = 1) -> Plan:
+        order = self.task_graph.topological_sort()
+        known = [d for d in (self._duration(t) for t in order) if d is not None]
+        default_duration = sum(known) / len(known) if known else None
+
+        planned: Dict[Task, PlannedTask] = dict()
+        for task in order:
+            action, reason = self._action(task, planned)
+            duration = self._duration(task)
+            if duration is None:
+                duration = default_duration
+            planned[task] = PlannedTask(task, action, reason, duration)
+
+        plan = Plan([planned[t] for t in order], parallelism)
+        if known:
+            plan.has_timing_data = True
+            self._estimate(plan.best_case, plan, planned, (Action.RUN,))
+            self._estimate(plan.worst_case, plan, planned, (Action.RUN, Action.MAYBE))
+        return plan
+
+    def _duration(self, task: Task) -> Optional[float]:
+        if task.id not in self.cache.tasks:
+            return None
+        return self.cache.tasks[task.id].duration
+
+    def _action(
+        self, task: Task, planned: Dict[Task, PlannedTask]
+    ) -> Tuple[Action, str]:
+        reason = self.cache.stale_reason(task)
+        if reason is not None:
+            return Action.RUN, reason
+        # upstream tasks that rebuild with identical outputs get cut off
+        for upstream in task.get_upstream():
+            if planned[upstream].action != Action.SKIP:
+                name = upstream.friendly_name
+                return Action.MAYBE, f"may run if outputs of {name} change"
+        return Action.SKIP, "up to date"
+
+    def _estimate(
+        self,
+        estimate: Estimate,
+        plan: Plan,
+        planned: Dict[Task, PlannedTask],
+        actions: Tuple[Action, ...],
+    ) -> None:
+        to_run = plan.with_action(*actions)
+        runs = set(p.task for p in to_run)
+        estimate.total_time = sum(p.duration for p in to_run)
+
+        # critical path: longest chain of tasks that will run
+        finish: Dict[Task, float] = dict()
+        previous: Dict[Task, Optional[Task]] = dict()
+        for p in plan.tasks:
+            start, previous[p.task] = 0.0, None
+            for upstream in p.task.get_upstream():
+                if finish[upstream] > start:
+                    start, previous[p.task] = finish[upstream], upstream
+            finish[p.task] = start + (p.duration if p.task in runs else 0.0)
+
+        if runs:
+            node = max(runs, key=finish.get)
+            estimate.critical_path_time = finish[node]
+            while node is not None:
+                if node in runs:
+                    estimate.critical_path.insert(0, planned[node])
+                node = previous[node]
+
+        # list scheduling of the tasks to run over `parallelism` workers
+        remaining = {
+            p.task: sum(1 for t in p.task.get_upstream() if t in runs) for p in to_run
+        }
+        ready = [p.task for p in to_run if remaining[p.task] == 0]
+        running: List = []
+        now = 0.0
+        counter = 0
+        while ready or running:
+            while ready and len(running) < max(plan.parallelism, 1):
+                task = ready.pop(0)
+                heapq.heappush(running, (now + planned[task].duration, counter, task))
+                counter += 1
+            now, _, task = heapq.heappop(running)
+            for t in task.get_downstream():
+                if t in remaining:
+                    remaining[t] -= 1
+                    if remaining[t] == 0:
+                        ready.append(t)
+        estimate.estimated_time = now
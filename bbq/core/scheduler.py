@@ -3,7 +3,7 @@ import logging
 import pickle
 import threading
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Type
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
 
 from bbq.core.cache import Cache
 from bbq.core.executor import Executor, LocalExecutor
@@ -28,6 +28,8 @@ class Scheduler:
         self.task_queue = Queue(queue_max_size, self.sched_type)
         self.result_queue = Queue(queue_max_size)  # this one is fifo by default
         self.pending = 0
+        self.cutoff = 0
+        self._changed: Set[Task] = set()
 
         # executor
         self.executor = executor(
@@ -64,6 +66,8 @@ class Scheduler:
         executor_thread = threading.Thread(target=self.executor.start)
         process_result_thread = threading.Thread(target=self._process_results)
 
+        self.cutoff = 0
+        self._changed = set()
         self._run_all_tasks()
 
         executor_thread.start()
@@ -78,9 +82,50 @@ class Scheduler:
             logging.info(f"Retrieving results for task {completed.friendly_name}")
             self.pending -= 1
             if completed.status == Status.SUCCESS:
-                for t in completed.get_downstream():
-                    self._queue_task_if_available(t)
+                if completed.output_changed:
+                    self._changed.add(completed)
+                    for t in completed.get_downstream():
+                        self._queue_task_if_available(t)
+                else:
+                    self._cut_off_downstream(completed)
         self.task_queue.close()
+        if self.cutoff > 0:
+            logging.info(
+                f"Early cutoff: skipped {self.cutoff} task(s) whose upstream outputs did not change"
+            )
+
+    def _cut_off_downstream(self, task: Task) -> None:
+        logging.info(
+            f"Outputs of task {task.friendly_name} are unchanged, cutting off its dependents"
+        )
+        visited: Set[Task] = set()
+        pending = list(task.get_downstream())
+        while len(pending) > 0:
+            t = pending.pop()
+            if t in visited:
+                continue
+            visited.add(t)
+            if not self._can_cut_off(t):
+                self._queue_task_if_available(t)
+                continue
+            logging.info(f"Skipping task {t.friendly_name} (early cutoff)")
+            t.status = Status.SKIPPED
+            self.cache.refresh_upstream_stat(t)
+            self.cutoff += 1
+            pending.extend(t.get_downstream())
+
+    def _can_cut_off(self, task: Task) -> bool:
+        # only tasks that were built before and have nothing in flight upstream
+        if task.status not in (Status.SKIPPED, Status.SUCCESS):
+            return False
+        if task.id not in self.cache.tasks:
+            return False
+        for t in task.get_upstream():
+            if t in self._changed:
+                return False
+            if t.status not in (Status.SKIPPED, Status.SUCCESS):
+                return False
+        return not self.cache.inputs_outdated(task)
 
     def _run_all_tasks(self) -> None:
         for task in self.tasks:
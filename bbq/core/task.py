@@ -1,6 +1,6 @@
 import subprocess
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, List, Set
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
 from uuid import uuid4
 
 from bbq.core.progress import Status
@@ -20,6 +20,10 @@ class Task:
         self.output: List[Path] = task_output or list()
         self.priority: float = priority
         self.status: Status = Status.NOT_STARTED
+        # whether the last run produced outputs different from the cached ones
+        self.output_changed: bool = True
+        # wall clock seconds taken by the last run
+        self.duration: Optional[float] = None
 
         # graph stuff
         self.downstream_tasks: Set["Task"] = set()
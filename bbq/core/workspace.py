@@ -0,0 +1,156 @@
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from bbq.core.cache import sha256sum
+from bbq.core.task import Task
+
+_SIZE_UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def _parse_size(size: Union[int, float, str, None]) -> Optional[int]:
+    if size is None:
+        return None
+    if isinstance(size, (int, float)):
+        return int(size)
+    value = str(size).strip().upper().rstrip("B")
+    try:
+        if value and value[-1] in _SIZE_UNITS:
+            return int(float(value[:-1]) * _SIZE_UNITS[value[-1]])
+        return int(float(value))
+    except ValueError:
+        raise ValueError(
+            f"invalid workspace_quota ({size!r}), expected bytes or a size like 10G"
+        ) from None
+
+
+def _disk_usage(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += (Path(root) / f).lstat().st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+class CachedWorkspace:
+    def __init__(self, name: str, path: Path) -> None:
+        self.name = name
+        self.path = path
+        self.last_used: float = 0.0
+        self.size: int = 0
+        # synced input file name ->
+        #   (source mtime_ns, source size, sha256, copy mtime_ns, copy size)
+        self.input: Dict[str, Tuple[int, int, str, int, int]] = dict()
+
+    def __repr__(self) -> str:
+        return str({"name": self.name, "last_used": self.last_used, "size": self.size})
+
+
+class WorkspaceManager:
+    """Keeps per-task workspaces alive between runs so that tools can reuse
+    intermediate files, and evicts the least recently used ones once the total
+    size goes above the configured quota."""
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        executor_config = self.config["system"]["executor"]
+        self.root: Path = Path(executor_config["workspace"])
+        self.quota: Optional[int] = _parse_size(executor_config.get("workspace_quota"))
+        self.workspaces: Dict[str, CachedWorkspace] = dict()
+
+    def __repr__(self) -> str:
+        return str(self.workspaces)
+
+    def acquire(self, task: Task) -> Path:
+        ws = self.workspaces.get(task.friendly_name)
+        if ws is None or not ws.path.is_dir():
+            ws = CachedWorkspace(task.friendly_name, self.root / task.friendly_name)
+            ws.path.mkdir(parents=True, exist_ok=True)
+            self.workspaces[ws.name] = ws
+        self._sync_inputs(ws, task)
+        # stale outputs must not pass for the result of a failed run
+        for out in task.output:
+            (ws.path / out).unlink(missing_ok=True)
+        ws.last_used = time.time()
+        return ws.path
+
+    def release(self, task: Task) -> None:
+        ws = self.workspaces.get(task.friendly_name)
+        if ws is None:
+            return
+        ws.size = _disk_usage(ws.path)
+        ws.last_used = time.time()
+        self._enforce_quota(keep=ws.name)
+
+    def evict(self, name: str) -> None:
+        ws = self.workspaces.pop(name, None)
+        if ws is None:
+            return
+        logging.info(f"Evicting workspace {ws.path} ({ws.size} bytes)")
+        shutil.rmtree(ws.path, ignore_errors=True)
+
+    def _sync_inputs(self, ws: CachedWorkspace, task: Task) -> None:
+        wanted = {Path(src).name: Path(src) for src in task.input}
+
+        # drop inputs that the task no longer uses
+        for name in list(ws.input):
+            if name not in wanted:
+                (ws.path / name).unlink(missing_ok=True)
+                del ws.input[name]
+
+        for name, src in wanted.items():
+            dst = ws.path / name
+            st = src.stat()
+            synced = ws.input.get(name)
+            if synced and self._copy_intact(dst, synced):
+                if synced[:2] == (st.st_mtime_ns, st.st_size):
+                    continue
+                digest = sha256sum(src)
+                if synced[2] == digest:
+                    ws.input[name] = (st.st_mtime_ns, st.st_size, digest) + synced[3:]
+                    continue
+            else:
+                digest = sha256sum(src)
+            logging.debug(f"Syncing {src} into workspace {ws.path}")
+            shutil.copy(src, dst)
+            dst_st = dst.stat()
+            ws.input[name] = (
+                st.st_mtime_ns,
+                st.st_size,
+                digest,
+                dst_st.st_mtime_ns,
+                dst_st.st_size,
+            )
+
+    def _copy_intact(self, dst: Path, synced: Tuple[int, int, str, int, int]) -> bool:
+        # the task may have edited its copy in place, e.g. by applying patches
+        if len(synced) != 5:
+            return False
+        try:
+            dst_st = dst.stat()
+        except FileNotFoundError:
+            return False
+        return synced[3:] == (dst_st.st_mtime_ns, dst_st.st_size)
+
+    def _enforce_quota(self, keep: Optional[str] = None) -> None:
+        if self.quota is None:
+            return
+        total = sum(ws.size for ws in self.workspaces.values())
+        lru = sorted(self.workspaces.values(), key=lambda ws: ws.last_used)
+        for ws in lru:
+            if total <= self.quota:
+                break
+            if ws.name == keep:
+                continue
+            total -= ws.size
+            self.evict(ws.name)
+        if total > self.quota:
+            logging.warning(
+                f"Workspace usage ({total} bytes) is above quota ({self.quota} bytes)"
+            )